@@ -4,6 +4,7 @@ Domain API Endpoints
 Handles domain suggestions, availability checks, and registrations.
 """
 
+import asyncio
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -20,8 +21,8 @@ from app.models.schemas import (
     DomainRegistrierung,
 )
 from app.services.domain_suggestion import DomainSuggestionService
-from app.services.inwx_service import INWXService
-from app.services.supabase_client import SupabaseService
+from app.services.inwx_service import INWXService, get_inwx
+from app.services.supabase_client import SupabaseService, get_db
 
 router = APIRouter(prefix="/domains", tags=["Domains"])
 
@@ -29,7 +30,8 @@ router = APIRouter(prefix="/domains", tags=["Domains"])
 @router.post("/suggest", response_model=DomainSuggestionResponse)
 async def suggest_domains(
     request: DomainSuggestionRequest,
-    token: str = Depends(verify_fake_token)
+    token: str = Depends(verify_fake_token),
+    db: SupabaseService = Depends(get_db)
 ):
     """
     Generate domain suggestions
@@ -40,13 +42,14 @@ async def suggest_domains(
     Args:
         request: Domain suggestion parameters
         token: Authentication token
+        db: Database service
 
     Returns:
         List of domain suggestions with pricing and priority
     """
-    suggestion_service = DomainSuggestionService()
+    suggestion_service = DomainSuggestionService(db)
 
-    suggestions = suggestion_service.generate_suggestions(
+    suggestions = await suggestion_service.generate_suggestions(
         wunschdomain_basis=request.wunschdomain_basis,
         land=request.land,
         branche=request.branche,
@@ -62,7 +65,9 @@ async def suggest_domains(
 @router.post("/check", response_model=DomainCheckResponse)
 async def check_domains(
     request: DomainCheckRequest,
-    token: str = Depends(verify_fake_token)
+    token: str = Depends(verify_fake_token),
+    inwx: INWXService = Depends(get_inwx),
+    db: SupabaseService = Depends(get_db)
 ):
     """
     Check domain availability via INWX API
@@ -70,6 +75,8 @@ async def check_domains(
     Args:
         request: List of domains to check
         token: Authentication token
+        inwx: Shared INWX service
+        db: Database service
 
     Returns:
         Availability results for each domain
@@ -77,36 +84,27 @@ async def check_domains(
     Raises:
         500: INWX API error
     """
-    db = SupabaseService()
-    results = []
+    tlds = list({domain.rsplit(".", 1)[-1] for domain in request.domains})
+
+    # Check all domains with a single INWX call while loading the
+    # pricing for all requested TLDs in one query
+    inwx_results, tld_map = await asyncio.gather(
+        inwx.check_domains_batch(request.domains),
+        db.aget_tlds_by_names(tlds)
+    )
 
-    async with INWXService() as inwx:
-        for domain in request.domains:
-            try:
-                # Check via INWX
-                inwx_result = await inwx.check_domain(domain)
-
-                # Get pricing from database
-                tld = domain.split(".")[-1]
-                tld_data = db.get_tld_by_name(tld)
-
-                result = DomainCheckResult(
-                    domain=domain,
-                    verfuegbar=inwx_result.get("avail", False),
-                    preis_eur=tld_data["vk_eur"] if tld_data else None,
-                    fehler=inwx_result.get("error")
-                )
-
-                results.append(result)
-
-            except Exception as e:
-                results.append(
-                    DomainCheckResult(
-                        domain=domain,
-                        verfuegbar=False,
-                        fehler=str(e)
-                    )
-                )
+    results = []
+    for domain, inwx_result in zip(request.domains, inwx_results):
+        tld_data = tld_map.get(domain.rsplit(".", 1)[-1])
+
+        results.append(
+            DomainCheckResult(
+                domain=domain,
+                verfuegbar=inwx_result.get("avail", False),
+                preis_eur=tld_data["vk_eur"] if tld_data else None,
+                fehler=inwx_result.get("error")
+            )
+        )
 
     return DomainCheckResponse(results=results)
 
@@ -114,7 +112,9 @@ async def check_domains(
 @router.post("/register", response_model=DomainRegisterResponse)
 async def register_domain(
     request: DomainRegisterRequest,
-    token: str = Depends(verify_fake_token)
+    token: str = Depends(verify_fake_token),
+    inwx: INWXService = Depends(get_inwx),
+    db: SupabaseService = Depends(get_db)
 ):
     """
     Register a domain (POC: Fake registration)
@@ -122,6 +122,8 @@ async def register_domain(
     Args:
         request: Domain registration request
         token: Authentication token
+        inwx: Shared INWX service
+        db: Database service
 
     Returns:
         Registration result
@@ -130,16 +132,6 @@ async def register_domain(
         404: Customer not found
         400: Invalid domain or TLD
     """
-    db = SupabaseService()
-
-    # Validate customer exists
-    kunde = db.get_kunde_by_id(request.kunden_id)
-    if not kunde:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Customer {request.kunden_id} not found"
-        )
-
     # Parse domain
     if "." not in request.domain:
         raise HTTPException(
@@ -151,8 +143,20 @@ async def register_domain(
     wunschdomain = parts[0]
     tld = parts[1]
 
+    # Load customer and TLD concurrently (independent lookups)
+    kunde, tld_data = await asyncio.gather(
+        db.aget_kunde_by_id(request.kunden_id),
+        db.aget_tld_by_name(tld)
+    )
+
+    # Validate customer exists
+    if not kunde:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customer {request.kunden_id} not found"
+        )
+
     # Validate TLD exists
-    tld_data = db.get_tld_by_name(tld)
     if not tld_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -160,16 +164,15 @@ async def register_domain(
         )
 
     # POC: Fake INWX registration
-    async with INWXService() as inwx:
-        inwx_result = await inwx.register_domain(
-            request.domain,
-            customer_data={}
-        )
+    inwx_result = await inwx.register_domain(
+        request.domain,
+        customer_data={}
+    )
 
     # Store registration in database
     registrierung_data = {
-        "id": str(uuid4()),
-        "kunden_id": str(request.kunden_id),
+        "id": uuid4(),
+        "kunden_id": request.kunden_id,
         "wunschdomain": wunschdomain,
         "tld": tld,
         "vollstaendige_domain": request.domain,
@@ -179,7 +182,7 @@ async def register_domain(
         "inwx_response_payload": inwx_result
     }
 
-    registrierung = db.create_domain_registrierung(registrierung_data)
+    registrierung = await db.acreate_domain_registrierung(registrierung_data)
 
     return DomainRegisterResponse(
         success=inwx_result.get("success", False),
@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.security_fake import verify_fake_token, get_saas_dienst_from_token
 from app.models.schemas import WizardStartResponse, Kunde, SaaSDienst
-from app.services.supabase_client import SupabaseService
+from app.services.supabase_client import SupabaseService, get_db
 
 router = APIRouter(prefix="/wizard", tags=["Wizard"])
 
@@ -18,7 +18,8 @@ router = APIRouter(prefix="/wizard", tags=["Wizard"])
 @router.get("/start/{kundenguid}", response_model=WizardStartResponse)
 async def wizard_start(
     kundenguid: UUID,
-    token: str = Depends(verify_fake_token)
+    token: str = Depends(verify_fake_token),
+    db: SupabaseService = Depends(get_db)
 ):
     """
     Start wizard flow for a customer
@@ -28,6 +29,7 @@ async def wizard_start(
     Args:
         kundenguid: Customer GUID from unternehmensdaten.org
         token: Authentication token (from X-Client-Token header)
+        db: Database service
 
     Returns:
         Customer and SaaS dienst data
@@ -36,23 +38,19 @@ async def wizard_start(
         404: Customer not found
         401: Invalid authentication
     """
-    db = SupabaseService()
-
     # Get SaaS dienst from token
     dienst_key = get_saas_dienst_from_token(token)
-    saas_dienst_data = db.get_saas_dienst_by_key(dienst_key)
 
-    if not saas_dienst_data:
+    # Get SaaS dienst and customer data in one query
+    wizard_data = await db.aget_wizard_start_data(kundenguid, dienst_key)
+
+    if not wizard_data or not wizard_data.get("saas_dienst"):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"SaaS dienst '{dienst_key}' not found in database"
         )
 
-    # Get customer data
-    kunde_data = db.get_kunde_by_id_and_dienst(
-        kunden_id=kundenguid,
-        saas_dienst_id=UUID(saas_dienst_data["id"])
-    )
+    kunde_data = wizard_data.get("kunde")
 
     if not kunde_data:
         raise HTTPException(
@@ -62,5 +60,5 @@ async def wizard_start(
 
     return WizardStartResponse(
         kunde=Kunde(**kunde_data),
-        saas_dienst=SaaSDienst(**saas_dienst_data)
+        saas_dienst=SaaSDienst(**wizard_data["saas_dienst"])
     )
@@ -4,7 +4,7 @@ Configuration Management for seitenkraft.org
 Loads environment variables and provides typed configuration objects.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,11 +28,20 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     supabase_db_password: Optional[str] = None
+    # Direct Postgres DSN for the asyncpg pool (optional, hot queries only).
+    # Use the direct DB host, not PgBouncer in transaction mode, otherwise
+    # prepared statements are not reused.
+    database_url: Optional[str] = None
+    database_pool_min_size: int = 4
+    database_pool_max_size: int = 20
+    # Prepared statements cached per connection (0 disables, e.g. for PgBouncer)
+    database_statement_cache_size: int = 500
 
     # INWX API
     inwx_api_url: str = "https://api.ote.inwx.com/jsonrpc/"
     inwx_username: str
     inwx_password: str
+    inwx_max_concurrency: int = 20  # Max. parallel INWX API requests per process
 
     # Fake Authentication (POC only)
     fake_auth_token: str = "dev-token-123"
@@ -44,7 +53,7 @@ class Settings(BaseSettings):
         "http://localhost:8080"
     ]
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production (based on INWX URL)"""
         return "api.inwx.com" in self.inwx_api_url
@@ -18,8 +18,8 @@ CREATE TABLE IF NOT EXISTS saas_dienste (
     aktualisiert_am TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
--- Index
-CREATE INDEX IF NOT EXISTS idx_saas_dienste_key ON saas_dienste(dienst_key);
+-- Index (dienst_key lookups use the UNIQUE constraint's index)
+DROP INDEX IF EXISTS idx_saas_dienste_key;
 CREATE INDEX IF NOT EXISTS idx_saas_dienste_aktiv ON saas_dienste(aktiv);
 
 -- ============================================================================
@@ -66,9 +66,12 @@ CREATE TABLE IF NOT EXISTS domains_tld (
     aktualisiert_am TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
--- Index for queries
-CREATE INDEX IF NOT EXISTS idx_domains_tld_aktiv ON domains_tld(aktiv);
-CREATE INDEX IF NOT EXISTS idx_domains_tld_prio ON domains_tld(prio DESC);
+-- No secondary indexes: lookups by name use the primary key. The active-TLD
+-- queries read every active row (get_all_active_tlds has no LIMIT) or sort by
+-- the country prio from domains_tld_land (tlds_for_country), which no index
+-- on this table can provide - the table is small enough to scan.
+DROP INDEX IF EXISTS idx_domains_tld_aktiv;
+DROP INDEX IF EXISTS idx_domains_tld_prio;
 
 -- ============================================================================
 -- Table: domains_tld_registrar (Registrar-specific TLD Pricing)
@@ -100,6 +103,19 @@ CREATE TABLE IF NOT EXISTS domains_tld_registrar (
 CREATE INDEX IF NOT EXISTS idx_domains_tld_registrar_tld ON domains_tld_registrar(tld);
 CREATE INDEX IF NOT EXISTS idx_domains_tld_registrar_registrar ON domains_tld_registrar(registrar_id);
 
+-- ============================================================================
+-- Table: domains_tld_land (Country-specific TLD Priority)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS domains_tld_land (
+    land VARCHAR(2) NOT NULL, -- ISO 3166-1 alpha-2 (DE, AT, CH, etc.)
+    tld VARCHAR(50) NOT NULL REFERENCES domains_tld(tld) ON DELETE CASCADE,
+    prio INTEGER NOT NULL, -- Überschreibt domains_tld.prio für dieses Land
+    erstellt_am TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    aktualisiert_am TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (land, tld)
+);
+
 -- ============================================================================
 -- Table: domain_registrierung (Domain Registration Records)
 -- ============================================================================
@@ -128,7 +144,9 @@ CREATE TABLE IF NOT EXISTS domain_registrierung (
 );
 
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_domain_registrierung_kunden ON domain_registrierung(kunden_id);
+-- Registrations per customer, newest first
+DROP INDEX IF EXISTS idx_domain_registrierung_kunden;
+CREATE INDEX IF NOT EXISTS idx_domain_registrierung_kunden_erstellt ON domain_registrierung(kunden_id, erstellt_am DESC);
 CREATE INDEX IF NOT EXISTS idx_domain_registrierung_domain ON domain_registrierung(vollstaendige_domain);
 CREATE INDEX IF NOT EXISTS idx_domain_registrierung_status ON domain_registrierung(status);
 CREATE INDEX IF NOT EXISTS idx_domain_registrierung_created ON domain_registrierung(erstellt_am DESC);
@@ -146,32 +164,82 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Apply trigger to all tables
+-- Apply trigger to all tables (dropped first so the schema can be re-applied)
+DROP TRIGGER IF EXISTS update_saas_dienste_aktualisiert_am ON saas_dienste;
 CREATE TRIGGER update_saas_dienste_aktualisiert_am
     BEFORE UPDATE ON saas_dienste
     FOR EACH ROW
     EXECUTE FUNCTION update_aktualisiert_am();
 
+DROP TRIGGER IF EXISTS update_kunden_aktualisiert_am ON kunden;
 CREATE TRIGGER update_kunden_aktualisiert_am
     BEFORE UPDATE ON kunden
     FOR EACH ROW
     EXECUTE FUNCTION update_aktualisiert_am();
 
+DROP TRIGGER IF EXISTS update_domains_tld_aktualisiert_am ON domains_tld;
 CREATE TRIGGER update_domains_tld_aktualisiert_am
     BEFORE UPDATE ON domains_tld
     FOR EACH ROW
     EXECUTE FUNCTION update_aktualisiert_am();
 
+DROP TRIGGER IF EXISTS update_domains_tld_registrar_aktualisiert_am ON domains_tld_registrar;
 CREATE TRIGGER update_domains_tld_registrar_aktualisiert_am
     BEFORE UPDATE ON domains_tld_registrar
     FOR EACH ROW
     EXECUTE FUNCTION update_aktualisiert_am();
 
+DROP TRIGGER IF EXISTS update_domains_tld_land_aktualisiert_am ON domains_tld_land;
+CREATE TRIGGER update_domains_tld_land_aktualisiert_am
+    BEFORE UPDATE ON domains_tld_land
+    FOR EACH ROW
+    EXECUTE FUNCTION update_aktualisiert_am();
+
+DROP TRIGGER IF EXISTS update_domain_registrierung_aktualisiert_am ON domain_registrierung;
 CREATE TRIGGER update_domain_registrierung_aktualisiert_am
     BEFORE UPDATE ON domain_registrierung
     FOR EACH ROW
     EXECUTE FUNCTION update_aktualisiert_am();
 
+-- ============================================================================
+-- Functions (called via Supabase RPC)
+-- ============================================================================
+
+-- Wizard start: SaaS dienst and customer in one round-trip
+-- Returns NULL if the dienst does not exist, "kunde" is NULL if the customer
+-- is not registered for this dienst
+CREATE OR REPLACE FUNCTION wizard_start(p_kunden_id UUID, p_dienst_key TEXT)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'saas_dienst', to_jsonb(d) - 'api_token',
+        'kunde', to_jsonb(k)
+    )
+    FROM saas_dienste d
+    LEFT JOIN kunden k ON k.id = p_kunden_id AND k.saas_dienst_id = d.id
+    WHERE d.dienst_key = p_dienst_key;
+$$ LANGUAGE sql STABLE;
+
+-- TLD suggestions for a country: ranked and limited server-side
+-- Country-specific prio (domains_tld_land) overrides the global prio
+CREATE OR REPLACE FUNCTION tlds_for_country(p_land TEXT, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    tld VARCHAR,
+    vk_eur NUMERIC,
+    aktiv BOOLEAN,
+    sortierung INTEGER,
+    tld_gruppe VARCHAR,
+    gruppe VARCHAR,
+    prio INTEGER
+) AS $$
+    SELECT t.tld, t.vk_eur, t.aktiv, t.sortierung, t.tld_gruppe, t.gruppe,
+           COALESCE(l.prio, t.prio) AS prio
+    FROM domains_tld t
+    LEFT JOIN domains_tld_land l ON l.tld = t.tld AND l.land = upper(p_land)
+    WHERE t.aktiv
+    ORDER BY COALESCE(l.prio, t.prio) DESC, t.sortierung
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================================
 -- Sample Data (for testing)
 -- ============================================================================
@@ -250,6 +318,7 @@ COMMENT ON TABLE saas_dienste IS 'SaaS Partner-Dienste (Handelshelfer, Handwerke
 COMMENT ON TABLE kunden IS 'Kundenstammdaten - Unternehmen aus unternehmensdaten.org, die über Partner-Dienste Domains registrieren';
 COMMENT ON TABLE domains_tld IS 'TLD-Stammdaten mit Verkaufspreisen und Metadaten';
 COMMENT ON TABLE domains_tld_registrar IS 'Registrar-spezifische Einkaufspreise (INWX, Schlundtech, etc.)';
+COMMENT ON TABLE domains_tld_land IS 'Länderspezifische TLD-Prioritäten für Domain-Vorschläge (überschreiben domains_tld.prio)';
 COMMENT ON TABLE domain_registrierung IS 'Domain-Registrierungen mit Status und INWX-Payloads';
 
 COMMENT ON COLUMN saas_dienste.dienst_key IS 'Eindeutiger Schlüssel für den Dienst (z.B. handelshelfer, handwerker24)';
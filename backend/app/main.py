@@ -4,22 +4,83 @@ seitenkraft.org Backend API
 FastAPI application for domain management and website generation.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import health, wizard, domains
 from app.core.config import get_settings
+from app.services.inwx_service import INWXService
+from app.services.pg_pool import close_pg_pool, init_pg_pool
+from app.services.supabase_client import get_supabase_service
 
 # Initialize settings
 settings = get_settings()
 
+# Countries whose TLD suggestions are prefetched at startup
+WARMUP_COUNTRIES = ("DE", "AT")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan
+
+    Startup: Creates the shared INWX session and warms up the Supabase
+    client and TLD cache, so the first request does not pay for it.
+    Shutdown: Logs out from INWX and closes the HTTP client and Postgres pool.
+    """
+    print("🚀 seitenkraft.org API starting...")
+    print(f"   Environment: {'Production' if settings.is_production else 'Development'}")
+    print(f"   INWX API: {settings.inwx_api_url}")
+    print(f"   Debug: {settings.debug}")
+
+    # Shared INWX session for all requests
+    app.state.inwx = INWXService()
+    try:
+        await app.state.inwx.login()
+    except Exception as e:
+        # Not fatal: check_domain logs in lazily on first use
+        print(f"   ⚠️  INWX login failed: {e}")
+
+    # Direct Postgres pool for hot queries (optional)
+    try:
+        if await init_pg_pool() is not None:
+            print("   Postgres pool: enabled")
+    except Exception as e:
+        # Not fatal: SupabaseService falls back to the Supabase client
+        print(f"   ⚠️  Postgres pool failed: {e}")
+
+    # Warm up Supabase client and TLD cache
+    try:
+        db = get_supabase_service()
+        for land in WARMUP_COUNTRIES:
+            db.get_tlds_for_country(land)
+    except Exception as e:
+        print(f"   ⚠️  Supabase warm-up failed: {e}")
+
+    yield
+
+    print("👋 seitenkraft.org API shutting down...")
+
+    try:
+        await app.state.inwx.logout()
+    finally:
+        await app.state.inwx.close()
+        await close_pg_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="seitenkraft.org API",
     description="Domain-Verwaltung & Website-Generierung für SaaS-Partner",
     version="0.1.0-poc",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Middleware
@@ -53,23 +114,6 @@ async def root():
     }
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Application startup"""
-    print("🚀 seitenkraft.org API starting...")
-    print(f"   Environment: {'Production' if settings.is_production else 'Development'}")
-    print(f"   INWX API: {settings.inwx_api_url}")
-    print(f"   Debug: {settings.debug}")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown"""
-    print("👋 seitenkraft.org API shutting down...")
-
-
 if __name__ == "__main__":
     import uvicorn
 
@@ -78,5 +122,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",  # libuv-based event loop (via uvicorn[standard])
+        http="httptools",  # C HTTP parser (via uvicorn[standard])
         log_level=settings.log_level.lower()
     )
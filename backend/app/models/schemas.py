@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 # ============================================================================
@@ -25,8 +25,7 @@ class SaaSDienst(SaaSDienstBase):
     erstellt_am: datetime
     aktualisiert_am: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -52,8 +51,7 @@ class Kunde(KundeBase):
     erstellt_am: datetime
     aktualisiert_am: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -75,8 +73,7 @@ class DomainTLD(DomainTLDBase):
     erstellt_am: datetime
     aktualisiert_am: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -103,8 +100,7 @@ class DomainRegistrierung(DomainRegistrierungBase):
     erstellt_am: datetime
     aktualisiert_am: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -5,93 +5,106 @@ Generates intelligent domain suggestions based on business data.
 """
 
 import re
+from functools import lru_cache
+from itertools import chain, islice
 from typing import Optional
+from pydantic import TypeAdapter
 from unidecode import unidecode
 
 from app.models.schemas import DomainSuggestion
 from app.services.supabase_client import SupabaseService
 
+# Patterns for clean_domain_name (applied to lowercased input)
+_SUFFIX_RE = re.compile(r'\b(gmbh|ag|kg|ohg|gbr|e\.?v\.?|ug|mbh)\b')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s-]')
+_DASH_RE = re.compile(r'[\s-]+')
 
-class DomainSuggestionService:
-    """Service for generating domain suggestions"""
+# Industry-specific keywords for domain variations
+_BRANCHE_KEYWORDS = {
+    "handwerker": ("handwerk", "meister", "service"),
+    "haendler": ("shop", "store", "markt"),
+    "dienstleister": ("service", "pro", "experte"),
+}
 
-    def __init__(self):
-        self.db = SupabaseService()
 
-    def clean_domain_name(self, name: str) -> str:
-        """
-        Clean and normalize domain name
+# Validates the whole suggestion list in one pass
+_SUGGESTIONS_ADAPTER = TypeAdapter(list[DomainSuggestion])
 
-        Args:
-            name: Raw business name
 
-        Returns:
-            Cleaned domain name (lowercase, ASCII, hyphens)
-        """
-        # Convert to ASCII (ä -> a, ö -> o, etc.)
-        name = unidecode(name)
+def _suggestion_sort_key(row: dict) -> tuple[bool, int]:
+    """Sort key: recommended first, then by priority (descending)"""
+    return (not row["empfohlen"], -row["prio"])
 
-        # Lowercase
-        name = name.lower()
 
-        # Remove common business suffixes
-        name = re.sub(r'\b(gmbh|ag|kg|ohg|gbr|e\.?v\.?|ug|mbh)\b', '', name, flags=re.IGNORECASE)
+@lru_cache(maxsize=4096)
+def clean_domain_name(name: str) -> str:
+    """
+    Clean and normalize domain name
 
-        # Remove special characters, keep letters, numbers, spaces, hyphens
-        name = re.sub(r'[^a-z0-9\s-]', '', name)
+    Pure function of its input, cached for repeated wizard requests.
 
-        # Replace multiple spaces/hyphens with single hyphen
-        name = re.sub(r'[\s-]+', '-', name)
+    Args:
+        name: Raw business name
 
-        # Remove leading/trailing hyphens
-        name = name.strip('-')
+    Returns:
+        Cleaned domain name (lowercase, ASCII, hyphens)
+    """
+    # Convert to ASCII (ä -> a, ö -> o, etc.)
+    name = unidecode(name)
 
-        return name
+    # Lowercase
+    name = name.lower()
 
-    def generate_variations(self, base: str, branche: Optional[str] = None) -> list[str]:
-        """
-        Generate domain name variations
+    # Remove common business suffixes
+    name = _SUFFIX_RE.sub('', name)
 
-        Args:
-            base: Base domain name
-            branche: Industry sector (optional)
+    # Remove special characters, keep letters, numbers, spaces, hyphens
+    name = _NON_ALNUM_RE.sub('', name)
 
-        Returns:
-            List of domain variations
-        """
-        variations = [base]
-
-        # Add industry-specific keywords
-        if branche:
-            branche_keywords = {
-                "handwerker": ["handwerk", "meister", "service"],
-                "haendler": ["shop", "store", "markt"],
-                "dienstleister": ["service", "pro", "experte"],
-            }
-
-            keywords = branche_keywords.get(branche, [])
-            for keyword in keywords:
-                variations.append(f"{base}-{keyword}")
-                variations.append(f"{keyword}-{base}")
-
-        # Add generic variations
-        variations.extend([
-            f"{base}-online",
-            f"mein-{base}",
-            f"{base}-24",
-        ])
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_variations = []
-        for v in variations:
-            if v not in seen:
-                seen.add(v)
-                unique_variations.append(v)
-
-        return unique_variations
-
-    def generate_suggestions(
+    # Replace multiple spaces/hyphens with single hyphen
+    name = _DASH_RE.sub('-', name)
+
+    # Remove leading/trailing hyphens
+    name = name.strip('-')
+
+    return name
+
+
+@lru_cache(maxsize=4096)
+def generate_variations(base: str, branche: Optional[str] = None) -> tuple[str, ...]:
+    """
+    Generate domain name variations
+
+    Pure function of its inputs, cached for repeated wizard requests.
+
+    Args:
+        base: Base domain name
+        branche: Industry sector (optional)
+
+    Returns:
+        Tuple of domain variations (immutable, as it is shared via the cache)
+    """
+    keywords = _BRANCHE_KEYWORDS.get(branche, ()) if branche else ()
+
+    variations = chain(
+        (base,),
+        # Industry-specific keywords
+        chain.from_iterable((f"{base}-{keyword}", f"{keyword}-{base}") for keyword in keywords),
+        # Generic variations
+        (f"{base}-online", f"mein-{base}", f"{base}-24"),
+    )
+
+    # Remove duplicates while preserving order
+    return tuple(dict.fromkeys(variations))
+
+
+class DomainSuggestionService:
+    """Service for generating domain suggestions"""
+
+    def __init__(self, db: SupabaseService):
+        self.db = db
+
+    async def generate_suggestions(
         self,
         wunschdomain_basis: str,
         land: str,
@@ -111,39 +124,36 @@ class DomainSuggestionService:
             List of domain suggestions with pricing and priority
         """
         # Clean the base domain
-        clean_base = self.clean_domain_name(wunschdomain_basis)
+        clean_base = clean_domain_name(wunschdomain_basis)
 
         # Generate variations
-        variations = self.generate_variations(clean_base, branche)
-
-        # Get recommended TLDs for country
-        tlds = self.db.get_tlds_for_country(land, limit=10)
-
-        # Generate suggestions
-        suggestions = []
-
-        for variation in variations[:5]:  # Limit variations
-            for tld_data in tlds:
-                if len(suggestions) >= max_suggestions:
-                    break
-
-                domain = f"{variation}.{tld_data['tld']}"
-
-                suggestion = DomainSuggestion(
-                    domain=domain,
-                    tld=tld_data['tld'],
-                    verfuegbar=None,  # Will be checked via INWX
-                    preis_eur=tld_data['vk_eur'],
-                    prio=tld_data['prio'],
-                    empfohlen=(variation == clean_base and tld_data['prio'] >= 90)
-                )
-
-                suggestions.append(suggestion)
-
-            if len(suggestions) >= max_suggestions:
-                break
+        variations = generate_variations(clean_base, branche)
+
+        # Get recommended TLDs for country (already ordered by prio DESC,
+        # sortierung in tlds_for_country, so the final sort gets nearly
+        # sorted input and keeps the configured order for equal prio)
+        tlds = await self.db.aget_tlds_for_country(land, limit=10)
+
+        # Generate suggestions (limit variations; check the base once per variation)
+        flagged_variations = [(v, v == clean_base) for v in variations[:5]]
+
+        rows = list(islice(
+            (
+                {
+                    "domain": f"{variation}.{tld_data['tld']}",
+                    "tld": tld_data['tld'],
+                    "verfuegbar": None,  # Will be checked via INWX
+                    "preis_eur": tld_data['vk_eur'],
+                    "prio": tld_data['prio'],
+                    "empfohlen": is_base and tld_data['prio'] >= 90
+                }
+                for variation, is_base in flagged_variations
+                for tld_data in tlds
+            ),
+            max_suggestions
+        ))
 
         # Sort by priority (descending) and recommended first
-        suggestions.sort(key=lambda s: (not s.empfohlen, -s.prio))
+        rows.sort(key=_suggestion_sort_key)
 
-        return suggestions[:max_suggestions]
+        return _SUGGESTIONS_ADAPTER.validate_python(rows)
@@ -5,11 +5,43 @@ Handles communication with INWX domain registrar API.
 Uses JSON-RPC over HTTPS.
 """
 
+import asyncio
 import httpx
+import idna
 from typing import Optional
 
+from fastapi import Request
+
 from app.core.config import get_settings
 
+# INWX result code for an invalid/expired session
+INWX_SESSION_EXPIRED_CODE = 2200
+
+# Process-wide limit for in-flight INWX requests (created on first use)
+_inwx_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_inwx_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent INWX requests"""
+    global _inwx_semaphore
+    if _inwx_semaphore is None:
+        _inwx_semaphore = asyncio.Semaphore(get_settings().inwx_max_concurrency)
+    return _inwx_semaphore
+
+
+def _domain_key(domain: str) -> str:
+    """
+    Normalize a domain for matching batch results to requested domains
+
+    INWX may echo domains in a different case or as punycode
+    ("müller.de" -> "xn--mller-kva.de"). Uses IDNA2008/UTS46 like INWX and
+    DENIC; Python's "idna" codec (IDNA2003) would map "ß" to "ss".
+    """
+    try:
+        return idna.encode(domain, uts46=True).decode("ascii")
+    except (UnicodeError, idna.IDNAError):
+        return domain.lower()
+
 
 class INWXService:
     """Service for INWX API communication"""
@@ -20,6 +52,23 @@ class INWXService:
         self.username = self.settings.inwx_username
         self.password = self.settings.inwx_password
         self._session_id: Optional[str] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._login_lock = asyncio.Lock()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use
+
+        All calls of this service instance reuse the same keep-alive
+        connection pool instead of opening a new TLS connection per call.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+        return self._client
 
     async def _call_api(self, method: str, params: Optional[dict] = None) -> dict:
         """
@@ -36,6 +85,27 @@ class INWXService:
             httpx.HTTPError: On network errors
             ValueError: On API errors
         """
+        # Session this request was sent with (checked after the response,
+        # because a concurrent re-login may have replaced it meanwhile)
+        expired_session_id = self._session_id
+        result = await self._post(method, params)
+
+        # Session expired: login again once and retry
+        if (
+            result.get("code") == INWX_SESSION_EXPIRED_CODE
+            and method not in ("account.login", "account.logout")
+            and expired_session_id
+        ):
+            async with self._login_lock:
+                if self._session_id == expired_session_id:
+                    self._session_id = None
+                    await self.login()
+            result = await self._post(method, params)
+
+        return result
+
+    async def _post(self, method: str, params: Optional[dict] = None) -> dict:
+        """Send a single JSON-RPC request and return its result"""
         payload = {
             "jsonrpc": "2.0",
             "method": method,
@@ -43,16 +113,16 @@ class INWXService:
             "id": 1
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(self.api_url, json=payload)
-            response.raise_for_status()
+        async with _get_inwx_semaphore():
+            response = await self._get_client().post(self.api_url, json=payload)
+        response.raise_for_status()
 
-            data = response.json()
+        data = response.json()
 
-            if "error" in data:
-                raise ValueError(f"INWX API Error: {data['error']}")
+        if "error" in data:
+            raise ValueError(f"INWX API Error: {data['error']}")
 
-            return data.get("result", {})
+        return data.get("result", {})
 
     async def login(self) -> str:
         """
@@ -78,6 +148,20 @@ class INWXService:
         self._session_id = result.get("resData", {}).get("sessid")
         return self._session_id
 
+    async def _ensure_logged_in(self):
+        """
+        Login on first use
+
+        Runs under _login_lock and re-checks the session afterwards (like the
+        re-login in _call_api), so concurrent first requests share one login
+        instead of overwriting each other's session.
+        """
+        if self._session_id:
+            return
+        async with self._login_lock:
+            if not self._session_id:
+                await self.login()
+
     async def logout(self):
         """Logout from INWX API"""
         if self._session_id:
@@ -105,9 +189,7 @@ class INWXService:
         Raises:
             ValueError: On API errors
         """
-        # Ensure we're logged in
-        if not self._session_id:
-            await self.login()
+        await self._ensure_logged_in()
 
         try:
             result = await self._call_api(
@@ -147,18 +229,80 @@ class INWXService:
         """
         Check multiple domains for availability
 
+        Uses a single domain.check call for all domains instead of one
+        call per domain.
+
         Args:
             domains: List of domain names
 
         Returns:
-            List of availability results
+            List of availability results (same order and format as
+            check_domain)
         """
-        results = []
-        for domain in domains:
-            result = await self.check_domain(domain)
-            results.append(result)
+        if not domains:
+            return []
 
-        return results
+        await self._ensure_logged_in()
+
+        try:
+            result = await self._call_api(
+                "domain.check",
+                {
+                    "domain": domains
+                }
+            )
+
+            if result.get("code") != 1000:
+                return [
+                    {
+                        "domain": domain,
+                        "avail": False,
+                        "status": "error",
+                        "error": result.get("msg")
+                    }
+                    for domain in domains
+                ]
+
+            # resData contains one entry per checked domain
+            res_data = result.get("resData", {})
+            entries = res_data.get("domain", []) if isinstance(res_data, dict) else res_data
+            entries_by_domain = {
+                _domain_key(entry.get("domain", "")): entry for entry in entries
+            }
+
+            results = []
+            for domain in domains:
+                entry = entries_by_domain.get(_domain_key(domain))
+
+                if entry is None:
+                    results.append({
+                        "domain": domain,
+                        "avail": False,
+                        "status": "error",
+                        "error": "No result returned by INWX"
+                    })
+                    continue
+
+                avail = entry.get("avail", 0) == 1
+                results.append({
+                    "domain": domain,
+                    "avail": avail,
+                    "status": "available" if avail else "registered",
+                    "price": entry.get("price")
+                })
+
+            return results
+
+        except Exception as e:
+            return [
+                {
+                    "domain": domain,
+                    "avail": False,
+                    "status": "error",
+                    "error": str(e)
+                }
+                for domain in domains
+            ]
 
     async def register_domain(self, domain: str, customer_data: dict) -> dict:
         """
@@ -185,11 +329,32 @@ class INWXService:
             "registration_id": f"fake-reg-{domain}"
         }
 
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def __aenter__(self):
         """Context manager entry"""
+        self._get_client()
         await self.login()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        await self.logout()
+        try:
+            await self.logout()
+        finally:
+            await self.close()
+
+
+async def get_inwx(request: Request) -> INWXService:
+    """
+    FastAPI dependency returning the shared INWX service
+
+    The service is created and logged in once at application startup
+    (see app.main) and reused for all requests. Declared async so FastAPI
+    does not dispatch this attribute lookup to the threadpool.
+    """
+    return request.app.state.inwx
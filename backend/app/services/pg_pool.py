@@ -0,0 +1,73 @@
+"""
+Postgres Connection Pool
+
+Direct asyncpg connection pool to the Supabase Postgres database.
+Used for the hot queries in SupabaseService. asyncpg prepares every query
+server-side and caches the prepared statement per connection (keyed by
+SQL text), so parsing/planning runs only once per query and connection -
+no explicit PREPARE/EXECUTE needed. Behind PgBouncer in transaction mode,
+set DATABASE_STATEMENT_CACHE_SIZE=0.
+
+The pool is optional: without DATABASE_URL, SupabaseService falls back
+to the Supabase (PostgREST) client.
+"""
+
+import json
+from typing import Optional
+
+import asyncpg
+
+from app.core.config import get_settings
+
+_pool: Optional[asyncpg.Pool] = None
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Decode JSON/JSONB columns to Python objects (like PostgREST does)"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog"
+        )
+
+
+async def init_pg_pool() -> Optional[asyncpg.Pool]:
+    """
+    Create the connection pool (called once at application startup)
+
+    Returns:
+        Pool, or None if DATABASE_URL is not configured
+    """
+    global _pool
+    settings = get_settings()
+
+    if _pool is None and settings.database_url:
+        _pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            statement_cache_size=settings.database_statement_cache_size,
+            init=_init_connection
+        )
+
+    return _pool
+
+
+async def close_pg_pool():
+    """Close the connection pool (called at application shutdown)"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def get_pg_pool() -> Optional[asyncpg.Pool]:
+    """
+    Get the connection pool
+
+    Returns:
+        Pool, or None if not configured/initialized
+    """
+    return _pool
@@ -2,15 +2,60 @@
 Supabase Client Service
 
 Provides database access using the Supabase Python client.
+Hot queries use the asyncpg pool (app.services.pg_pool) when configured.
 """
 
+import asyncio
+import threading
 from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
+import httpx
+import orjson
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from postgrest.utils import SyncClient
 from supabase import create_client, Client
 
 from app.core.config import get_settings
+from app.services.pg_pool import get_pg_pool
+
+
+# In-process caches for rarely changing lookup data (TTL in seconds)
+LOOKUP_CACHE_TTL = 300
+
+_tld_cache = TTLCache(maxsize=512, ttl=LOOKUP_CACHE_TTL)
+_all_active_tlds_cache = TTLCache(maxsize=1, ttl=60)
+_tlds_for_country_cache = TTLCache(maxsize=256, ttl=LOOKUP_CACHE_TTL)
+_saas_dienst_cache = TTLCache(maxsize=256, ttl=LOOKUP_CACHE_TTL)
+_cache_lock = threading.Lock()
+_MISSING = object()
+
+# Column projections (only what the API models need)
+_SAAS_DIENST_COLUMNS = "id,dienst_key,name,aktiv,whitelabel_config,erstellt_am,aktualisiert_am"
+_KUNDE_COLUMNS = (
+    "id,saas_dienst_id,name,email,land,branche,"
+    "unternehmensdaten_sync_am,erstellt_am,aktualisiert_am"
+)
+_TLD_COLUMNS = "tld,vk_eur,aktiv,sortierung,tld_gruppe,gruppe,prio"
+_REGISTRIERUNG_LIST_COLUMNS = (
+    "id,kunden_id,wunschdomain,tld,vollstaendige_domain,vk_preis_eur,"
+    "status,erstellt_am,aktualisiert_am"
+)
+_REGISTRIERUNG_COLUMNS = (
+    f"{_REGISTRIERUNG_LIST_COLUMNS},inwx_request_payload,inwx_response_payload"
+)
+
+# Hot queries for the asyncpg pool (fixed SQL text -> reused prepared statements)
+_SQL_KUNDE_BY_ID = f"SELECT {_KUNDE_COLUMNS} FROM kunden WHERE id = $1"
+_SQL_TLD_BY_NAME = f"SELECT {_TLD_COLUMNS} FROM domains_tld WHERE tld = $1"
+_SQL_TLDS_BY_NAMES = f"SELECT {_TLD_COLUMNS} FROM domains_tld WHERE tld = ANY($1::varchar[])"
+
+
+def _json_row(row: dict) -> dict:
+    """Convert UUID values to str for PostgREST's JSON body (asyncpg binds them natively)"""
+    return {key: str(value) if isinstance(value, UUID) else value for key, value in row.items()}
 
 
 @lru_cache
@@ -22,7 +67,44 @@ def get_supabase_client() -> Client:
         Supabase Client
     """
     settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_key)
+    client = create_client(settings.supabase_url, settings.supabase_key)
+    _tune_postgrest_session(client)
+    return client
+
+
+def _use_orjson(response: httpx.Response):
+    """
+    Response hook: decode the body with orjson instead of json.loads
+
+    postgrest-py parses every result via response.json(); the body is read
+    lazily, so the replacement only runs once postgrest-py asks for it.
+    """
+    response.json = lambda **kwargs: orjson.loads(response.content)
+
+
+def _tune_postgrest_session(client: Client):
+    """
+    Replace the PostgREST HTTP session with a tuned keep-alive pool
+
+    supabase-py keeps one PostgREST session per client; with HTTP/2 and
+    longer keep-alive, TLS handshakes are amortized across many queries.
+    Responses are decoded with orjson (see _use_orjson). httpx negotiates
+    compression itself and adds br once the brotli package is installed.
+    """
+    session = client.postgrest.session
+    client.postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        limits=httpx.Limits(
+            max_connections=50,
+            max_keepalive_connections=50,
+            keepalive_expiry=30
+        ),
+        http2=True,
+        event_hooks={"response": [_use_orjson]}
+    )
+    session.close()
 
 
 class SupabaseService:
@@ -35,15 +117,31 @@ class SupabaseService:
     # SaaS Dienste
     # ========================================================================
 
+    @cached(_saas_dienst_cache, key=lambda self, dienst_key: hashkey("key", dienst_key), lock=_cache_lock)
     def get_saas_dienst_by_key(self, dienst_key: str) -> Optional[dict]:
         """Get SaaS dienst by key"""
-        response = self.client.table("saas_dienste").select("*").eq("dienst_key", dienst_key).execute()
-        return response.data[0] if response.data else None
+        response = (
+            self.client.table("saas_dienste")
+            .select(_SAAS_DIENST_COLUMNS)
+            .eq("dienst_key", dienst_key)
+            .limit(1)
+            .maybe_single()
+            .execute()
+        )
+        return response.data if response else None
 
+    @cached(_saas_dienst_cache, key=lambda self, dienst_id: hashkey("id", str(dienst_id)), lock=_cache_lock)
     def get_saas_dienst_by_id(self, dienst_id: UUID) -> Optional[dict]:
         """Get SaaS dienst by ID"""
-        response = self.client.table("saas_dienste").select("*").eq("id", str(dienst_id)).execute()
-        return response.data[0] if response.data else None
+        response = (
+            self.client.table("saas_dienste")
+            .select(_SAAS_DIENST_COLUMNS)
+            .eq("id", str(dienst_id))
+            .limit(1)
+            .maybe_single()
+            .execute()
+        )
+        return response.data if response else None
 
     # ========================================================================
     # Kunden
@@ -53,32 +151,82 @@ class SupabaseService:
         """Get customer by ID and service"""
         response = (
             self.client.table("kunden")
-            .select("*")
+            .select(_KUNDE_COLUMNS)
             .eq("id", str(kunden_id))
             .eq("saas_dienst_id", str(saas_dienst_id))
+            .limit(1)
+            .maybe_single()
             .execute()
         )
-        return response.data[0] if response.data else None
+        return response.data if response else None
 
     def get_kunde_by_id(self, kunden_id: UUID) -> Optional[dict]:
         """Get customer by ID (any service)"""
-        response = self.client.table("kunden").select("*").eq("id", str(kunden_id)).execute()
-        return response.data[0] if response.data else None
+        response = (
+            self.client.table("kunden")
+            .select(_KUNDE_COLUMNS)
+            .eq("id", str(kunden_id))
+            .limit(1)
+            .maybe_single()
+            .execute()
+        )
+        return response.data if response else None
+
+    async def aget_kunde_by_id(self, kunden_id: UUID) -> Optional[dict]:
+        """Async variant of get_kunde_by_id (asyncpg pool or worker thread)"""
+        pool = get_pg_pool()
+        if pool is None:
+            return await asyncio.to_thread(self.get_kunde_by_id, kunden_id)
+
+        row = await pool.fetchrow(_SQL_KUNDE_BY_ID, kunden_id)
+        return dict(row) if row else None
 
     def create_kunde(self, kunde_data: dict) -> dict:
-        """Create new customer"""
-        response = self.client.table("kunden").insert(kunde_data).execute()
+        """
+        Create or update customer
+
+        Upserts on (id, saas_dienst_id), so callers don't need a separate
+        existence check before creating a customer.
+        """
+        response = (
+            self.client.table("kunden")
+            .upsert(kunde_data, on_conflict="id,saas_dienst_id", ignore_duplicates=False)
+            .execute()
+        )
         return response.data[0]
 
+    # ========================================================================
+    # Wizard
+    # ========================================================================
+
+    def get_wizard_start_data(self, kunden_id: UUID, dienst_key: str) -> Optional[dict]:
+        """
+        Get SaaS dienst and customer in one query (RPC wizard_start)
+
+        Returns:
+            {"saas_dienst": dict, "kunde": dict | None}, or None if the
+            dienst does not exist
+        """
+        response = self.client.rpc(
+            "wizard_start",
+            {"p_kunden_id": str(kunden_id), "p_dienst_key": dienst_key}
+        ).execute()
+        return response.data or None
+
+    async def aget_wizard_start_data(self, kunden_id: UUID, dienst_key: str) -> Optional[dict]:
+        """Async variant of get_wizard_start_data (runs in a worker thread)"""
+        return await asyncio.to_thread(self.get_wizard_start_data, kunden_id, dienst_key)
+
     # ========================================================================
     # Domain TLDs
     # ========================================================================
 
+    @cached(_all_active_tlds_cache, key=lambda self: hashkey("all"), lock=_cache_lock)
     def get_all_active_tlds(self) -> list[dict]:
         """Get all active TLDs sorted by priority"""
         response = (
             self.client.table("domains_tld")
-            .select("*")
+            .select(_TLD_COLUMNS)
             .eq("aktiv", True)
             .order("prio", desc=True)
             .order("sortierung", desc=False)
@@ -86,49 +234,131 @@ class SupabaseService:
         )
         return response.data
 
+    @cached(_tld_cache, key=lambda self, tld: hashkey(tld), lock=_cache_lock)
     def get_tld_by_name(self, tld: str) -> Optional[dict]:
         """Get TLD by name"""
-        response = self.client.table("domains_tld").select("*").eq("tld", tld).execute()
-        return response.data[0] if response.data else None
-
-    def get_tlds_for_country(self, land: str, limit: int = 10) -> list[dict]:
-        """Get recommended TLDs for a specific country"""
-        # For POC: Simple logic - return top TLDs
-        # Future: More sophisticated country-specific logic
         response = (
             self.client.table("domains_tld")
-            .select("*")
-            .eq("aktiv", True)
-            .order("prio", desc=True)
-            .limit(limit)
+            .select(_TLD_COLUMNS)
+            .eq("tld", tld)
+            .limit(1)
+            .maybe_single()
             .execute()
         )
+        return response.data if response else None
+
+    async def aget_tld_by_name(self, tld: str) -> Optional[dict]:
+        """Async variant of get_tld_by_name (asyncpg pool or worker thread)"""
+        pool = get_pg_pool()
+        if pool is None:
+            return await asyncio.to_thread(self.get_tld_by_name, tld)
+
+        # Shares the TTL cache with get_tld_by_name
+        key = hashkey(tld)
+        with _cache_lock:
+            tld_data = _tld_cache.get(key, _MISSING)
+        if tld_data is not _MISSING:
+            return tld_data
+
+        row = await pool.fetchrow(_SQL_TLD_BY_NAME, tld)
+        tld_data = dict(row) if row else None
+        with _cache_lock:
+            _tld_cache[key] = tld_data
+        return tld_data
+
+    def get_tlds_by_names(self, tlds: list[str]) -> dict[str, dict]:
+        """Get multiple TLDs in one query, keyed by TLD name"""
+        if not tlds:
+            return {}
+        response = self.client.table("domains_tld").select(_TLD_COLUMNS).in_("tld", tlds).execute()
+        return {row["tld"]: row for row in response.data}
+
+    async def aget_tlds_by_names(self, tlds: list[str]) -> dict[str, dict]:
+        """Async variant of get_tlds_by_names (asyncpg pool or worker thread)"""
+        pool = get_pg_pool()
+        if pool is None:
+            return await asyncio.to_thread(self.get_tlds_by_names, tlds)
+
+        if not tlds:
+            return {}
+        rows = await pool.fetch(_SQL_TLDS_BY_NAMES, tlds)
+        return {row["tld"]: dict(row) for row in rows}
+
+    @cached(
+        _tlds_for_country_cache,
+        key=lambda self, land, limit=10: hashkey(land, limit),
+        lock=_cache_lock
+    )
+    def get_tlds_for_country(self, land: str, limit: int = 10) -> list[dict]:
+        """
+        Get recommended TLDs for a specific country (RPC tlds_for_country)
+
+        Ranking (country-specific prio from domains_tld_land, falling back
+        to the global prio) and limit are applied in the database.
+        """
+        response = self.client.rpc(
+            "tlds_for_country",
+            {"p_land": land, "p_limit": limit}
+        ).execute()
         return response.data
 
+    async def aget_tlds_for_country(self, land: str, limit: int = 10) -> list[dict]:
+        """Async variant of get_tlds_for_country (runs in a worker thread)"""
+        return await asyncio.to_thread(self.get_tlds_for_country, land, limit)
+
+    def invalidate_tlds(self):
+        """Clear all cached TLD data (call after changing domains_tld)"""
+        with _cache_lock:
+            _tld_cache.clear()
+            _all_active_tlds_cache.clear()
+            _tlds_for_country_cache.clear()
+
     # ========================================================================
     # Domain Registrierungen
     # ========================================================================
 
     def create_domain_registrierung(self, registrierung_data: dict) -> dict:
         """Create domain registration record"""
-        response = self.client.table("domain_registrierung").insert(registrierung_data).execute()
+        response = (
+            self.client.table("domain_registrierung")
+            .insert(_json_row(registrierung_data))
+            .execute()
+        )
         return response.data[0]
 
+    async def acreate_domain_registrierung(self, registrierung_data: dict) -> dict:
+        """Async variant of create_domain_registrierung (asyncpg pool or worker thread)"""
+        pool = get_pg_pool()
+        if pool is None:
+            return await asyncio.to_thread(self.create_domain_registrierung, registrierung_data)
+
+        # Column names come from our own code, values are bound as parameters
+        columns = list(registrierung_data)
+        query = (
+            f"INSERT INTO domain_registrierung ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(columns) + 1))}) "
+            f"RETURNING {_REGISTRIERUNG_COLUMNS}"
+        )
+        row = await pool.fetchrow(query, *registrierung_data.values())
+        return dict(row)
+
     def get_domain_registrierung_by_id(self, registrierung_id: UUID) -> Optional[dict]:
         """Get domain registration by ID"""
         response = (
             self.client.table("domain_registrierung")
-            .select("*")
+            .select(_REGISTRIERUNG_COLUMNS)
             .eq("id", str(registrierung_id))
+            .limit(1)
+            .maybe_single()
             .execute()
         )
-        return response.data[0] if response.data else None
+        return response.data if response else None
 
     def get_registrierungen_by_kunde(self, kunden_id: UUID) -> list[dict]:
         """Get all registrations for a customer"""
         response = (
             self.client.table("domain_registrierung")
-            .select("*")
+            .select(_REGISTRIERUNG_LIST_COLUMNS)
             .eq("kunden_id", str(kunden_id))
             .order("erstellt_am", desc=True)
             .execute()
@@ -153,3 +383,19 @@ class SupabaseService:
             .execute()
         )
         return response.data[0]
+
+
+@lru_cache
+def get_supabase_service() -> SupabaseService:
+    """
+    Get cached SupabaseService instance.
+
+    Returns:
+        Process-wide SupabaseService
+    """
+    return SupabaseService()
+
+
+async def get_db() -> SupabaseService:
+    """FastAPI dependency returning the shared SupabaseService"""
+    return get_supabase_service()
@@ -18,10 +18,13 @@ Optional Arguments:
     --drop-tables - Drop existing tables before creating (DESTRUCTIVE!)
 """
 
+import mmap
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
 try:
     from dotenv import load_dotenv
@@ -94,6 +97,7 @@ def load_environment():
     print_warning("No .env file found, using system environment variables")
 
 
+@lru_cache
 def get_db_connection_string() -> str:
     """
     Build PostgreSQL connection string from Supabase URL
@@ -121,12 +125,13 @@ def get_db_connection_string() -> str:
 
     # Extract project reference from URL
     # e.g., https://xxxxx.supabase.co -> xxxxx
-    if "supabase.co" in supabase_url:
-        project_ref = supabase_url.split("//")[1].split(".")[0]
-        db_host = f"db.{project_ref}.supabase.co"
-    else:
+    hostname = urlsplit(supabase_url).hostname or ""
+    if not hostname.endswith(".supabase.co"):
         raise ValueError(f"Invalid SUPABASE_URL format: {supabase_url}")
 
+    project_ref = hostname.split(".", 1)[0]
+    db_host = f"db.{project_ref}.supabase.co"
+
     connection_string = f"postgresql://postgres:{db_password}@{db_host}:5432/postgres"
     return connection_string
 
@@ -144,15 +149,30 @@ def get_db_connection():
         raise
 
 
-def load_schema_sql() -> str:
-    """Load SQL schema from file"""
+SAMPLE_DATA_MARKER = b"-- Sample Data (for testing)"
+
+
+def load_schema_sql(skip_sample_data: bool = False) -> str:
+    """
+    Load SQL schema from file
+
+    The file is memory-mapped, so with skip_sample_data only the part
+    before the sample data marker is copied and decoded.
+    """
     schema_path = Path(__file__).parent.parent / "app" / "db" / "supabase_schema.sql"
 
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_path}")
 
-    with open(schema_path, 'r', encoding='utf-8') as f:
-        sql_content = f.read()
+    with open(schema_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = mm.find(SAMPLE_DATA_MARKER) if skip_sample_data else -1
+
+        if end >= 0:
+            sql_content = mm[:end].decode('utf-8')
+            print_info("Skipping sample data insertion")
+        else:
+            sql_content = mm[:].decode('utf-8')
 
     print_success(f"Loaded schema from: {schema_path}")
     return sql_content
@@ -165,27 +185,38 @@ def drop_tables(cursor):
     drop_commands = [
         "DROP TABLE IF EXISTS domain_registrierung CASCADE;",
         "DROP TABLE IF EXISTS domains_tld_registrar CASCADE;",
+        "DROP TABLE IF EXISTS domains_tld_land CASCADE;",
         "DROP TABLE IF EXISTS domains_tld CASCADE;",
         "DROP TABLE IF EXISTS kunden CASCADE;",
+        "DROP TABLE IF EXISTS saas_dienste CASCADE;",
         "DROP FUNCTION IF EXISTS update_aktualisiert_am() CASCADE;",
+        "DROP FUNCTION IF EXISTS wizard_start(UUID, TEXT) CASCADE;",
+        "DROP FUNCTION IF EXISTS tlds_for_country(TEXT, INTEGER) CASCADE;",
     ]
 
-    for cmd in drop_commands:
-        try:
-            cursor.execute(cmd)
-            print_info(f"  Dropped: {cmd.split()[4]}")
-        except Exception as e:
-            print_warning(f"  Could not drop: {e}")
+    # Single round-trip; runs as one implicit transaction (all or nothing)
+    try:
+        cursor.execute("\n".join(drop_commands))
+        for cmd in drop_commands:
+            print_info(f"  Dropped: {cmd.split()[4].split('(')[0]}")
+    except Exception as e:
+        print_warning(f"  Could not drop: {e}")
 
 
-def execute_schema(cursor, sql_content: str, skip_sample_data: bool = False):
-    """Execute SQL schema"""
-    if skip_sample_data:
-        # Remove sample data section
-        if "-- Sample Data (for testing)" in sql_content:
-            sql_content = sql_content.split("-- Sample Data (for testing)")[0]
-            print_info("Skipping sample data insertion")
+def execute_schema(cursor, sql_content: str):
+    """
+    Execute SQL schema
 
+    The whole file is sent in a single execute (one round-trip); the
+    server runs the statements in order. Sample data uses multi-row
+    INSERT ... VALUES, so do not split the file into per-statement calls.
+    Larger seed data should be loaded with COPY (cursor.copy_expert).
+
+    The batch runs as one implicit transaction: a single failing statement
+    rolls back the whole file. Keep every statement re-runnable (IF NOT
+    EXISTS, CREATE OR REPLACE, DROP ... IF EXISTS) so the schema can be
+    re-applied to an existing database.
+    """
     try:
         cursor.execute(sql_content)
         print_success("Schema executed successfully")
@@ -194,42 +225,61 @@ def execute_schema(cursor, sql_content: str, skip_sample_data: bool = False):
         raise
 
 
-def verify_setup(cursor):
+def verify_setup(conn, cursor):
     """Verify that tables were created"""
     print_header("Verifying Setup")
 
-    # Check tables
-    cursor.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public'
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
-    """)
-
-    tables = cursor.fetchall()
-
-    if not tables:
+    # Check tables (streamed via a named server-side cursor; WITH HOLD
+    # because the connection runs in autocommit mode)
+    existing_tables = set()
+
+    with conn.cursor(name="verify_tables", withhold=True) as table_cursor:
+        table_cursor.itersize = 1000
+        table_cursor.execute("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            AND table_type = 'BASE TABLE'
+            ORDER BY table_name;
+        """)
+
+        for (table_name,) in table_cursor:
+            existing_tables.add(table_name)
+            print(f"  • {table_name}")
+
+    if not existing_tables:
         print_error("No tables found!")
         return False
 
-    print_success(f"Found {len(tables)} tables:")
-    for table in tables:
-        print(f"  • {table[0]}")
+    print_success(f"Found {len(existing_tables)} tables")
 
     # Check row counts
     print("\n" + Colors.BOLD + "Row counts:" + Colors.ENDC)
 
-    table_names = ['kunden', 'domains_tld', 'domains_tld_registrar', 'domain_registrierung']
+    table_names = [
+        'saas_dienste', 'kunden', 'domains_tld', 'domains_tld_registrar',
+        'domains_tld_land', 'domain_registrierung'
+    ]
+
     for table_name in table_names:
+        if table_name not in existing_tables:
+            print_warning(f"  • {table_name}: Could not count - table not found")
+
+    # Count all tables in one round-trip
+    count_tables = [t for t in table_names if t in existing_tables]
+    if count_tables:
         try:
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(
-                sql.Identifier(table_name)
+            cursor.execute(sql.SQL(" UNION ALL ").join(
+                sql.SQL("SELECT {}, COUNT(*) FROM {}").format(
+                    sql.Literal(table_name),
+                    sql.Identifier(table_name)
+                )
+                for table_name in count_tables
             ))
-            count = cursor.fetchone()[0]
-            print(f"  • {table_name}: {count} rows")
+            for table_name, count in cursor.fetchall():
+                print(f"  • {table_name}: {count} rows")
         except Exception as e:
-            print_warning(f"  • {table_name}: Could not count - {e}")
+            print_warning(f"  • Could not count rows - {e}")
 
     return True
 
@@ -280,14 +330,14 @@ def main():
 
         # Load schema
         print_header("Loading Schema")
-        sql_content = load_schema_sql()
+        sql_content = load_schema_sql(skip_sample_data=args.skip_sample_data)
 
         # Execute schema
         print_header("Executing Schema")
-        execute_schema(cursor, sql_content, skip_sample_data=args.skip_sample_data)
+        execute_schema(cursor, sql_content)
 
         # Verify
-        verify_setup(cursor)
+        verify_setup(conn, cursor)
 
         # Close connection
         cursor.close()
@@ -0,0 +1,12 @@
+"""
+Shared test setup
+
+Provides the required settings so app modules can be imported without a .env.
+"""
+
+import os
+
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("INWX_USERNAME", "test-user")
+os.environ.setdefault("INWX_PASSWORD", "test-password")
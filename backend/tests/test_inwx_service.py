@@ -0,0 +1,206 @@
+"""
+Tests for INWXService: check_domains_batch and session re-login
+
+The INWX API is replaced by a fake _call_api or _post; no network access.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.inwx_service import INWX_SESSION_EXPIRED_CODE, INWXService
+
+
+def make_service(result=None, error=None) -> INWXService:
+    """Create a logged-in service whose domain.check returns result (or raises error)"""
+    service = INWXService()
+    service._session_id = "test-session"
+
+    async def fake_call_api(method, params=None):
+        if error is not None:
+            raise error
+        return result
+
+    service._call_api = fake_call_api
+    return service
+
+
+def check_result(entries: list[dict]) -> dict:
+    """Successful domain.check response with one resData entry per domain"""
+    return {"code": 1000, "msg": "Command completed successfully", "resData": {"domain": entries}}
+
+
+async def test_results_follow_input_order():
+    service = make_service(check_result([
+        {"domain": "example.com", "avail": 0},
+        {"domain": "example.de", "avail": 1, "price": 8.99},
+    ]))
+
+    results = await service.check_domains_batch(["example.de", "example.com"])
+
+    assert [r["domain"] for r in results] == ["example.de", "example.com"]
+    assert results[0] == {"domain": "example.de", "avail": True, "status": "available", "price": 8.99}
+    assert results[1]["avail"] is False
+    assert results[1]["status"] == "registered"
+
+
+async def test_missing_domain_is_reported_as_error():
+    service = make_service(check_result([{"domain": "example.de", "avail": 1}]))
+
+    results = await service.check_domains_batch(["example.de", "example.com"])
+
+    assert results[0]["status"] == "available"
+    assert results[1] == {
+        "domain": "example.com",
+        "avail": False,
+        "status": "error",
+        "error": "No result returned by INWX",
+    }
+
+
+async def test_response_in_different_case_is_matched():
+    service = make_service(check_result([{"domain": "EXAMPLE.DE", "avail": 1}]))
+
+    results = await service.check_domains_batch(["Example.de"])
+
+    assert results[0]["domain"] == "Example.de"
+    assert results[0]["status"] == "available"
+
+
+async def test_response_in_punycode_is_matched():
+    service = make_service(check_result([{"domain": "xn--mller-kva.de", "avail": 1}]))
+
+    results = await service.check_domains_batch(["müller.de"])
+
+    assert results[0]["domain"] == "müller.de"
+    assert results[0]["status"] == "available"
+
+
+async def test_sharp_s_and_ss_are_different_domains():
+    service = make_service(check_result([
+        {"domain": "strasse.de", "avail": 0},
+        {"domain": "xn--strae-oqa.de", "avail": 1},
+    ]))
+
+    results = await service.check_domains_batch(["strasse.de", "straße.de"])
+
+    assert results[0]["status"] == "registered"
+    assert results[1]["domain"] == "straße.de"
+    assert results[1]["status"] == "available"
+
+
+async def test_response_error_code_marks_all_domains():
+    service = make_service({"code": 2400, "msg": "Command failed"})
+
+    results = await service.check_domains_batch(["example.de", "example.com"])
+
+    assert [r["domain"] for r in results] == ["example.de", "example.com"]
+    assert all(r["status"] == "error" and r["error"] == "Command failed" for r in results)
+    assert all(r["avail"] is False for r in results)
+
+
+async def test_api_exception_marks_all_domains():
+    service = make_service(error=ValueError("INWX API Error: boom"))
+
+    results = await service.check_domains_batch(["example.de", "example.com"])
+
+    assert all(r["status"] == "error" and r["error"] == "INWX API Error: boom" for r in results)
+
+
+async def test_empty_input_skips_api_call():
+    service = make_service(error=AssertionError("must not be called"))
+
+    assert await service.check_domains_batch([]) == []
+
+
+async def test_concurrent_first_requests_login_once():
+    service = make_service(check_result([{"domain": "example.de", "avail": 1}]))
+    service._session_id = None
+    logins = 0
+
+    async def fake_login():
+        nonlocal logins
+        logins += 1
+        await asyncio.sleep(0)
+        service._session_id = f"session-{logins}"
+        return service._session_id
+
+    service.login = fake_login
+
+    await asyncio.gather(*(service.check_domains_batch(["example.de"]) for _ in range(5)))
+
+    assert logins == 1
+    assert service._session_id == "session-1"
+
+
+
+# ============================================================================
+# Session re-login (_call_api)
+# ============================================================================
+
+class FakeINWX:
+    """Fake _post: answers 2200 for requests sent with an expired session"""
+
+    def __init__(self, service: INWXService, login_code: int = 1000):
+        self.service = service
+        self.login_code = login_code
+        self.calls: list[tuple[str, str | None]] = []
+        self.logins = 0
+        service._post = self.post
+
+    async def post(self, method, params=None):
+        session_id = self.service._session_id
+        self.calls.append((method, session_id))
+        await asyncio.sleep(0)  # let concurrent callers interleave
+
+        if method == "account.login":
+            self.logins += 1
+            return {"code": self.login_code, "msg": "login", "resData": {"sessid": f"session-{self.logins}"}}
+        if session_id == "expired":
+            return {"code": INWX_SESSION_EXPIRED_CODE, "msg": "Session expired"}
+        return {"code": 1000, "resData": {"avail": 1}}
+
+
+async def test_expired_session_logs_in_once_and_retries():
+    service = INWXService()
+    service._session_id = "expired"
+    fake = FakeINWX(service)
+
+    result = await service._call_api("domain.check", {"domain": "example.de"})
+
+    assert result["code"] == 1000
+    assert fake.calls == [
+        ("domain.check", "expired"),
+        ("account.login", None),
+        ("domain.check", "session-1"),
+    ]
+
+
+async def test_concurrent_expired_callers_share_one_relogin():
+    service = INWXService()
+    service._session_id = "expired"
+    fake = FakeINWX(service)
+
+    results = await asyncio.gather(
+        service._call_api("domain.check", {"domain": "example.de"}),
+        service._call_api("domain.check", {"domain": "example.com"}),
+    )
+
+    assert [r["code"] for r in results] == [1000, 1000]
+    assert [call for call in fake.calls if call[0] == "domain.check"][:2] == [
+        ("domain.check", "expired"),
+        ("domain.check", "expired"),
+    ]
+    assert fake.logins == 1
+    assert service._session_id == "session-1"
+
+
+async def test_login_is_never_retried():
+    service = INWXService()
+    service._session_id = "expired"
+    fake = FakeINWX(service, login_code=INWX_SESSION_EXPIRED_CODE)
+
+    with pytest.raises(ValueError, match="INWX login failed"):
+        await service.login()
+
+    assert fake.calls == [("account.login", "expired")]